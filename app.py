@@ -1,26 +1,114 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+import os
+import time
+import tempfile
+from google.oauth2.service_account import Credentials
 from datetime import timedelta, datetime
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
 # --- 設定 ---
 SHEET_NAME = "Daily_Stock_Data"
+DATA_TTL = 300  # 資料快取秒數 (記憶體與本機檔案共用)
+DISK_CACHE_PATH = os.path.join(tempfile.gettempdir(), "daily_stock.parquet")
+# resample 規則對應的 Period 頻率 (月K 的 'ME' 在 Period 中為 'M')
+PERIOD_FREQ = {'W-FRI': 'W-FRI', 'ME': 'M'}
+NUMERIC_COLS = ['Open', 'High', 'Low', 'Close', 'Upper_Pass', 'Mid_Pass', 'Lower_Pass', 'Divider', 'Long_Cost', 'Short_Cost', 'Sell_Pressure', 'Volume']
 st.set_page_config(page_title="台股期貨AI儀表板", layout="wide")
 
+# --- 頁首樣式與標題 (固定字串，只建立一次) ---
+HEADER_HTML = """
+        <style>
+            .block-container { padding-top: 1rem; padding-bottom: 1rem; }
+            .header-container { display: flex; align-items: baseline; padding-bottom: 8px; border-bottom: 1px solid #eee; margin-bottom: 15px; }
+            .main-title { font-size: 1.5rem; font-weight: bold; color: #333; margin-right: 12px; }
+            .sub-title { font-size: 0.8rem; color: #888; font-weight: normal; }
+            button[data-baseweb="tab"] > div { font-size: 1.2rem; font-weight: bold; width: 50px; text-align: center; }
+        </style>
+        <div class="header-container">
+            <span class="main-title">📊 台股期貨盤後分析</span>
+            <span class="sub-title">數據來源：Google Sheet | 每日更新</span>
+        </div>
+    """
+
+# --- 數值欄位解析：去千分位逗號，無法轉換者為 NaN ---
+def _parse_numeric(s):
+    if pd.api.types.is_numeric_dtype(s):
+        return pd.to_numeric(s, errors='coerce')
+    # 非數值型別 (object / pandas 3 的 str) 一律先轉字串再去逗號
+    return pd.to_numeric(s.astype(str).str.replace(',', '', regex=False), errors='coerce')
+
 # --- 連接 Google Sheet (讀取日資料) ---
+# 授權與開啟試算表每個 process 只做一次，跨 rerun / session 共用同一個工作表物件
+@st.cache_resource
+def _get_sheet():
+    creds_dict = dict(st.secrets["gcp_service_account"])
+    scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
+    creds = Credentials.from_service_account_info(creds_dict, scopes=scope)
+    return gspread.authorize(creds).open(SHEET_NAME).sheet1
+
+# 資料快取 5 分鐘，切換分頁 / 展開表格不會重新連線
+# 失敗時直接丟出例外，不寫入快取，下次 rerun 會重試
+@st.cache_data(ttl=DATA_TTL, show_spinner=False)
+def _load_data():
+    # 程式重啟後若本機快取檔仍在有效期內，直接讀檔，不必連 Google Sheet
+    try:
+        fresh = time.time() - os.path.getmtime(DISK_CACHE_PATH) < DATA_TTL
+    except OSError:
+        fresh = False  # 沒有快取檔
+    if fresh:
+        try:
+            return pd.read_parquet(DISK_CACHE_PATH)
+        except (OSError, ValueError):
+            # 檔案損壞或格式不相容 (pyarrow 的讀取錯誤為 OSError / ValueError 子類別)：刪檔後改讀 Google Sheet
+            try:
+                os.remove(DISK_CACHE_PATH)
+            except OSError:
+                pass
+
+    values = _get_sheet().get_all_values()
+    if not values:
+        return pd.DataFrame()
+    df = pd.DataFrame(values[1:], columns=[c.strip() for c in values[0]])
+
+    # Bot 寫入格式固定為 YYYY-MM-DD，指定格式走快速解析；遇到其他格式再退回通用解析
+    raw_dates = df.pop('Date')
+    try:
+        dates = pd.to_datetime(raw_dates, format='%Y-%m-%d')
+    except ValueError:
+        dates = pd.to_datetime(raw_dates)
+    df = df.set_index(pd.DatetimeIndex(dates, name='Date'))
+    # Bot 每日依序附加，通常已是遞增順序，只有亂序時才排序
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index(kind='stable')
+
+    # 數值欄位在寫入快取前就轉好型別，快取內容為 float32 而非字串物件
+    # 指數 / 成本皆為 5 位數以內，float32 精度已足夠，記憶體減半
+    present = [c for c in NUMERIC_COLS if c in df.columns]
+    df[present] = df[present].apply(_parse_numeric).astype('float32')
+    if 'Sell_Pressure' in df.columns:
+        df['Sell_Pressure'] = df['Sell_Pressure'].fillna(0)
+
+    # 先寫到同目錄的暫存檔再整檔替換，中途失敗或多個 process 同時寫入都不會留下寫一半的快取檔
+    tmp_path = f"{DISK_CACHE_PATH}.{os.getpid()}.tmp"
+    try:
+        df.to_parquet(tmp_path)
+        os.replace(tmp_path, DISK_CACHE_PATH)
+    except Exception:
+        # 寫檔失敗不影響顯示，下次再從 Google Sheet 讀
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return df
+
 def get_data():
     try:
         if "gcp_service_account" in st.secrets:
-            creds_dict = dict(st.secrets["gcp_service_account"])
-            scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
-            creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
-            client = gspread.authorize(creds)
-            sheet = client.open(SHEET_NAME).sheet1
-            data = sheet.get_all_records()
-            return pd.DataFrame(data)
+            return _load_data()
         else:
             st.error("找不到 Secrets 設定 (gcp_service_account)")
             return pd.DataFrame()
@@ -28,23 +116,33 @@ def get_data():
         st.error(f"資料庫連線失敗: {e}")
         return pd.DataFrame()
 
+# 手動刷新：清除資料 / 重取樣 / 圖表快取與本機快取檔，下次 rerun 直接重讀 Google Sheet
+# (手動修正既有日期的資料時，最後日期與筆數不變，衍生快取的鍵無法察覺，需一併清除)
+def _refresh_data():
+    _load_data.clear()
+    _resampled.clear()
+    _cached_chart.clear()
+    try:
+        os.remove(DISK_CACHE_PATH)
+    except OSError:
+        pass
+
 # --- 自定義數據卡片 ---
-def display_card(label, value, color="black", help_text=""):
+def card_html(label, value, color="black", help_text="", flex=1):
     tooltip_html = f'title="{help_text}"' if help_text else ''
-    st.markdown(f"""
-        <div style="
-            background-color: white;
-            padding: 10px 5px;
-            border-radius: 8px;
-            border: 1px solid #e0e0e0;
-            text-align: center;
-            box-shadow: 0 1px 3px rgba(0,0,0,0.05);
-            margin-bottom: 10px;
-            " {tooltip_html}>
-            <div style="font-size: 0.85rem; color: #666; margin-bottom: 2px;">{label}</div>
-            <div style="font-size: 1.6rem; font-weight: bold; color: {color}; line-height: 1.1;">{value}</div>
-        </div>
-    """, unsafe_allow_html=True)
+    return (
+        f'<div style="flex: {flex}; min-width: {140 * flex}px; background-color: white; padding: 10px 5px; border-radius: 8px; '
+        f'border: 1px solid #e0e0e0; text-align: center; box-shadow: 0 1px 3px rgba(0,0,0,0.05); '
+        f'margin-bottom: 10px;" {tooltip_html}>'
+        f'<div style="font-size: 0.85rem; color: #666; margin-bottom: 2px;">{label}</div>'
+        f'<div style="font-size: 1.6rem; font-weight: bold; color: {color}; line-height: 1.1;">{value}</div>'
+        '</div>'
+    )
+
+# 所有卡片合併成一列，只送出一次 st.markdown
+def display_cards(cards):
+    html = '<div style="display: flex; flex-wrap: wrap; gap: 1rem;">' + "".join(cards) + '</div>'
+    st.markdown(html, unsafe_allow_html=True)
 
 # --- 資料重取樣工具 ---
 def resample_df(df, rule):
@@ -57,16 +155,59 @@ def resample_df(df, rule):
     }
     if 'Volume' in df.columns:
         logic['Volume'] = 'sum'
-    resampled = df.resample(rule).agg(logic)
-    resampled = resampled.dropna(subset=['Open', 'High', 'Low', 'Close'])
-    return resampled
+    # 依週期分組 (不會產生空的區間)，逐欄聚合後組成結果
+    g = df.groupby(df.index.to_period(PERIOD_FREQ.get(rule, rule)))
+    resampled = pd.DataFrame({col: g[col].agg(how) for col, how in logic.items()})
+    # 標籤與 resample 一致：取週期最後一天 (週五 / 月底)
+    resampled.index = resampled.index.to_timestamp(how='end').normalize()
+    keep = np.isfinite(resampled[['Open', 'High', 'Low', 'Close']].to_numpy()).all(axis=1)
+    return resampled[keep]
+
+# 以 (最後日期, 筆數) 當快取鍵，_df 不參與 hash，避免每次 rerun 重算週K/月K
+# 只保留 週K/月K × 目前與前一版資料，舊版本自動淘汰
+@st.cache_data(max_entries=4, show_spinner=False)
+def _resampled(data_key, rule, _df):
+    return resample_df(_df, rule)
+
+# --- 圖表版型：子圖結構與版面設定固定不變，只在載入時建一次 ---
+def _make_template(show_pressure):
+    # --- 情況 A: 要顯示賣壓 (日K) ---
+    if show_pressure:
+        fig = make_subplots(
+            rows=2, cols=1, 
+            shared_xaxes=True, 
+            vertical_spacing=0.03, 
+            row_heights=[0.7, 0.3],
+            subplot_titles=("指數走勢", "賣壓指標")
+        )
+    # --- 情況 B: 不顯示賣壓 (週K/月K)，只有單一圖表，不需要 subplots ---
+    else:
+        fig = go.Figure()
+
+    # --- 通用版面設定 ---
+    fig.update_layout(
+        margin=dict(l=10, r=50, t=30, b=10),
+        height=500, # 高度統一
+        xaxis_rangeslider_visible=False,
+        showlegend=False,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        yaxis=dict(tickformat=".0f"), # Y軸不顯示 K
+    )
+    
+    # 強制 X 軸為類別模式 (移除空隙)
+    fig.update_xaxes(type='category', showgrid=True, gridcolor='#eee', gridwidth=1, 
+                     tickmode='auto', nticks=10)
+    fig.update_yaxes(showgrid=True, gridcolor='#eee', gridwidth=1)
+    return fig
+
+_TEMPLATES = {True: _make_template(True), False: _make_template(False)}
 
 # --- ★ 核心：繪製互動式圖表 (Plotly) ---
 # 新增參數 show_pressure 來控制是否顯示賣壓
-def plot_interactive_chart(df, p_max=0, p_min=0, date_max=None, date_min=None, show_pressure=True):
-    # 複製一份資料並建立字串格式的日期 (消除假日空隙)
-    df = df.copy()
-    df['Date_Str'] = df.index.strftime('%Y-%m-%d')
+def build_chart(df, p_max=0, p_min=0, date_max=None, date_min=None, show_pressure=True):
+    # 建立字串格式的日期當 X 軸 (消除假日空隙)，不複製整份資料
+    x_cat = df.index.strftime('%Y-%m-%d').to_numpy()
     
     # 定義 Tooltip 格式 (不顯示 K，只顯示數字)
     hover_text_k = (
@@ -78,24 +219,20 @@ def plot_interactive_chart(df, p_max=0, p_min=0, date_max=None, date_min=None, s
         "<extra></extra>" 
     )
 
-    # --- 情況 A: 要顯示賣壓 (日K) ---
-    if show_pressure:
-        fig = make_subplots(
-            rows=2, cols=1, 
-            shared_xaxes=True, 
-            vertical_spacing=0.03, 
-            row_heights=[0.7, 0.3],
-            subplot_titles=("指數走勢", "賣壓指標")
-        )
+    # 從版型複製一份 (保留子圖設定)，只填入資料
+    fig = go.Figure(_TEMPLATES[show_pressure])
+    candle = go.Candlestick(
+        x=x_cat, 
+        open=df['Open'].to_numpy(), high=df['High'].to_numpy(),
+        low=df['Low'].to_numpy(), close=df['Close'].to_numpy(),
+        increasing_line_color='red', decreasing_line_color='green',
+        name='K線',
+        hovertemplate=hover_text_k
+    )
 
+    if show_pressure:
         # 1. K 線圖 (放在第 1 列)
-        fig.add_trace(go.Candlestick(
-            x=df['Date_Str'], 
-            open=df['Open'], high=df['High'], low=df['Low'], close=df['Close'],
-            increasing_line_color='red', decreasing_line_color='green',
-            name='K線',
-            hovertemplate=hover_text_k
-        ), row=1, col=1)
+        fig.add_trace(candle, row=1, col=1)
 
         # 2. 賣壓 Bar 圖 (放在第 2 列)
         hover_text_bar = (
@@ -104,8 +241,8 @@ def plot_interactive_chart(df, p_max=0, p_min=0, date_max=None, date_min=None, s
             "<extra></extra>"
         )
         fig.add_trace(go.Bar(
-            x=df['Date_Str'], 
-            y=df['Sell_Pressure'],
+            x=x_cat, 
+            y=df['Sell_Pressure'].to_numpy(),
             marker_color='blue', opacity=0.3,
             name='賣壓',
             hovertemplate=hover_text_bar
@@ -113,154 +250,108 @@ def plot_interactive_chart(df, p_max=0, p_min=0, date_max=None, date_min=None, s
 
         # 3. 畫賣壓虛線 (僅在顯示賣壓時才畫)
         chart_start_date = df.index[0]
-        chart_end_date_str = df['Date_Str'].iloc[-1]
-
-        if p_max > 0 and date_max is not None:
-            if date_max < chart_start_date:
-                start_x = df['Date_Str'].iloc[0]
-            else:
-                try: start_x = date_max.strftime('%Y-%m-%d')
-                except: start_x = df['Date_Str'].iloc[0]
-
-            fig.add_shape(type="line", x0=start_x, x1=chart_end_date_str, y0=p_max, y1=p_max,
-                line=dict(color="red", width=1.5, dash="dash"), row=2, col=1)
-            fig.add_annotation(x=chart_end_date_str, y=p_max, text=f"{p_max:.1f}",
-                showarrow=False, xanchor="left", yanchor="middle", font=dict(color="red"), row=2, col=1)
-
-        if p_min > 0 and date_min is not None:
-            if date_min < chart_start_date:
-                start_x = df['Date_Str'].iloc[0]
-            else:
-                try: start_x = date_min.strftime('%Y-%m-%d')
-                except: start_x = df['Date_Str'].iloc[0]
-
-            fig.add_shape(type="line", x0=start_x, x1=chart_end_date_str, y0=p_min, y1=p_min,
-                line=dict(color="green", width=1.5, dash="dash"), row=2, col=1)
-            fig.add_annotation(x=chart_end_date_str, y=p_min, text=f"{p_min:.1f}",
-                showarrow=False, xanchor="left", yanchor="middle", font=dict(color="green"), row=2, col=1)
-
-    # --- 情況 B: 不顯示賣壓 (週K/月K) ---
-    else:
-        # 只有單一圖表，不需要 subplots
-        fig = go.Figure()
+        x0, chart_end_date_str = x_cat[0], x_cat[-1]
+
+        # 極值日期早於圖表起點時，虛線從圖表最左邊開始
+        def _resolve_start(d):
+            return x0 if d < chart_start_date else d.strftime('%Y-%m-%d')
+
+        # 先收集虛線與標籤，最後一次寫入 layout (第 2 列子圖對應 x2/y2)
+        shapes, annots = [], []
+        for p_val, d_val, color in ((p_max, date_max, "red"), (p_min, date_min, "green")):
+            if p_val > 0 and d_val is not None:
+                shapes.append(dict(type="line", xref="x2", yref="y2",
+                    x0=_resolve_start(d_val), x1=chart_end_date_str, y0=p_val, y1=p_val,
+                    line=dict(color=color, width=1.5, dash="dash")))
+                annots.append(dict(xref="x2", yref="y2", x=chart_end_date_str, y=p_val, text=f"{p_val:.1f}",
+                    showarrow=False, xanchor="left", yanchor="middle", font=dict(color=color)))
 
+        # subplot_titles 本身也是 annotations，需保留
+        if shapes:
+            fig.update_layout(shapes=shapes, annotations=list(fig.layout.annotations) + annots)
+
+    else:
         # 只加 K 線圖
-        fig.add_trace(go.Candlestick(
-            x=df['Date_Str'], 
-            open=df['Open'], high=df['High'], low=df['Low'], close=df['Close'],
-            increasing_line_color='red', decreasing_line_color='green',
-            name='K線',
-            hovertemplate=hover_text_k
-        ))
+        fig.add_trace(candle)
 
-    # --- 通用版面設定 ---
-    fig.update_layout(
-        margin=dict(l=10, r=50, t=30, b=10),
-        height=500, # 高度統一
-        xaxis_rangeslider_visible=False,
-        showlegend=False,
-        plot_bgcolor='white',
-        paper_bgcolor='white',
-        yaxis=dict(tickformat=".0f"), # Y軸不顯示 K
-    )
-    
-    # 強制 X 軸為類別模式 (移除空隙)
-    fig.update_xaxes(type='category', showgrid=True, gridcolor='#eee', gridwidth=1, 
-                     tickmode='auto', nticks=10)
-    fig.update_yaxes(showgrid=True, gridcolor='#eee', gridwidth=1)
+    return fig
+
+# 圖表快取：以 (週期, 日資料版本) 為鍵，資料未更新時直接取回已建好的 Figure
+@st.cache_data(max_entries=8, show_spinner=False)
+def _cached_chart(chart_key, _df, p_max, p_min, date_max, date_min, show_pressure):
+    return build_chart(_df, p_max, p_min, date_max, date_min, show_pressure)
 
-    st.plotly_chart(fig, use_container_width=True)
+# data_key 為日資料的 (最後日期, 筆數)；週K/月K 的最後一根標籤在同週/同月內不變，不能用圖上資料當鍵
+def plot_interactive_chart(df, rule, data_key, p_max=0, p_min=0, date_max=None, date_min=None, show_pressure=True):
+    chart_key = (rule, data_key)
+    fig = _cached_chart(chart_key, df, p_max, p_min, date_max, date_min, show_pressure)
+    st.plotly_chart(fig, use_container_width=True, key=f"chart_{rule}")
 
 
 # --- 主程式 ---
 def main():
-    st.markdown("""
-        <style>
-            .block-container { padding-top: 1rem; padding-bottom: 1rem; }
-            .header-container { display: flex; align-items: baseline; padding-bottom: 8px; border-bottom: 1px solid #eee; margin-bottom: 15px; }
-            .main-title { font-size: 1.5rem; font-weight: bold; color: #333; margin-right: 12px; }
-            .sub-title { font-size: 0.8rem; color: #888; font-weight: normal; }
-            button[data-baseweb="tab"] > div { font-size: 1.2rem; font-weight: bold; width: 50px; text-align: center; }
-        </style>
-        <div class="header-container">
-            <span class="main-title">📊 台股期貨盤後分析</span>
-            <span class="sub-title">數據來源：Google Sheet | 每日更新</span>
-        </div>
-    """, unsafe_allow_html=True)
+    st.markdown(HEADER_HTML, unsafe_allow_html=True)
+    st.button("🔄 強制刷新", on_click=_refresh_data)
 
     df = get_data()
     
     if not df.empty:
-        # 資料清洗
-        df['Date'] = pd.to_datetime(df['Date'])
-        df = df.sort_values(by="Date")
-
-        numeric_cols = ['Open', 'High', 'Low', 'Close', 'Upper_Pass', 'Mid_Pass', 'Lower_Pass', 'Divider', 'Long_Cost', 'Short_Cost', 'Sell_Pressure', 'Volume']
-        for col in numeric_cols:
-            if col in df.columns:
-                df[col] = df[col].astype(str).str.replace(',', '').replace('nan', '')
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        if 'Sell_Pressure' in df.columns:
-            df['Sell_Pressure'] = df['Sell_Pressure'].fillna(0)
-        
-        df = df.set_index('Date')
         last_row = df.iloc[-1]
         
-        def fmt(val):
-            try: return str(int(val))
-            except: return "0"
-
-        ref_divider = float(last_row.get('Divider', 0))
-        ref_long = float(last_row.get('Long_Cost', 0))
-        ref_short = float(last_row.get('Short_Cost', 0))
+        # 卡片數值一次轉成整數字串 (缺欄或空值顯示 0)
+        card_cols = ['Divider', 'Upper_Pass', 'Mid_Pass', 'Lower_Pass', 'Long_Cost', 'Short_Cost']
+        fmt_row = last_row.reindex(card_cols).fillna(0).astype('int64').astype(str)
 
         # 頂部資訊卡片
-        c1, c2, c3, c4, c5 = st.columns([1, 1, 2, 1, 1])
-        with c1: display_card("📅 最新日期", last_row.name.strftime("%Y-%m-%d"))
-        with c2: display_card("⚖️ 明日多空分界", fmt(ref_divider), color="#333", help_text="(開+低+收)/3")
-        with c3: display_card("🔮 明日三關價", f"{fmt(last_row.get('Upper_Pass',0))}/{fmt(last_row.get('Mid_Pass',0))}/{fmt(last_row.get('Lower_Pass',0))}", color="#555")
-        with c4: display_card("🔴 外資多方成本", fmt(ref_long), color="#d63031")
-        with c5: display_card("🟢 外資空方成本", fmt(ref_short), color="#00b894")
+        display_cards([
+            card_html("📅 最新日期", last_row.name.strftime("%Y-%m-%d")),
+            card_html("⚖️ 明日多空分界", fmt_row['Divider'], color="#333", help_text="(開+低+收)/3"),
+            card_html("🔮 明日三關價", f"{fmt_row['Upper_Pass']}/{fmt_row['Mid_Pass']}/{fmt_row['Lower_Pass']}", color="#555", flex=2),
+            card_html("🔴 外資多方成本", fmt_row['Long_Cost'], color="#d63031"),
+            card_html("🟢 外資空方成本", fmt_row['Short_Cost'], color="#00b894"),
+        ])
 
         # 準備上個月賣壓數據 (僅用於日K)
         current_date = last_row.name
         first_day_this_month = current_date.replace(day=1)
         last_day_prev_month = first_day_this_month - timedelta(days=1)
-        target_year = last_day_prev_month.year
-        target_month = last_day_prev_month.month
+        first_day_prev_month = last_day_prev_month.replace(day=1)
         
-        mask = (df.index.year == target_year) & (df.index.month == target_month)
-        prev_month_df = df[mask]
+        # index 已依日期排序，直接用日期區間切片 (二分搜尋，不建整段遮罩)
+        prev_month_df = df.loc[first_day_prev_month:last_day_prev_month]
         
         if not prev_month_df.empty:
-            p_max = float(prev_month_df['Sell_Pressure'].max())
-            p_min = float(prev_month_df['Sell_Pressure'].min())
-            date_max = prev_month_df['Sell_Pressure'].idxmax()
-            date_min = prev_month_df['Sell_Pressure'].idxmin()
+            # Sell_Pressure 已補 0，直接在 numpy 陣列上找極值位置
+            sp = prev_month_df['Sell_Pressure'].to_numpy()
+            i_max, i_min = sp.argmax(), sp.argmin()
+            p_max, p_min = float(sp[i_max]), float(sp[i_min])
+            date_max, date_min = prev_month_df.index[i_max], prev_month_df.index[i_min]
         else:
             p_max, p_min = 0.0, 0.0
             date_max, date_min = None, None
 
         # 標籤切換區
+        data_key = (df.index[-1], len(df))
         tab_d, tab_w, tab_m = st.tabs(["D", "W", "M"])
 
         with tab_d:
-            # 日K：show_pressure=True
-            plot_interactive_chart(df.tail(60), p_max, p_min, date_max, date_min, show_pressure=True)
+            # 日K：有賣壓資料才顯示賣壓子圖 (舊資料全為 0 時省掉整個子圖)
+            df_d = df.iloc[-60:]
+            has_pressure = bool(np.abs(df_d['Sell_Pressure'].to_numpy()).sum() > 0)
+            plot_interactive_chart(df_d, 'D', data_key, p_max, p_min, date_max, date_min, show_pressure=has_pressure)
 
         with tab_w:
-            df_w = resample_df(df, 'W-FRI')
+            df_w = _resampled(data_key, 'W-FRI', df)
             # 週K：show_pressure=False
-            plot_interactive_chart(df_w.tail(60), show_pressure=False)
+            plot_interactive_chart(df_w.tail(60), 'W-FRI', data_key, show_pressure=False)
 
         with tab_m:
-            df_m = resample_df(df, 'ME')
+            df_m = _resampled(data_key, 'ME', df)
             # 月K：show_pressure=False
-            plot_interactive_chart(df_m.tail(60), show_pressure=False)
+            plot_interactive_chart(df_m.tail(60), 'ME', data_key, show_pressure=False)
 
         with st.expander("查看詳細歷史數據"):
-            st.dataframe(df.sort_index(ascending=False), use_container_width=True)
+            st.dataframe(df.iloc[::-1], use_container_width=True)
 
     else:
         st.warning("⚠️ 資料庫為空或無法讀取，請檢查 Google Sheet 連線。")
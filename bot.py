@@ -6,7 +6,7 @@ import json
 import io
 import urllib3
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from google.oauth2.service_account import Credentials
 
 # --- 設定 ---
 SHEET_NAME = "Daily_Stock_Data" 
@@ -23,7 +23,7 @@ def get_google_sheet():
     try:
         creds_dict = json.loads(json_creds)
         scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
-        creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
+        creds = Credentials.from_service_account_info(creds_dict, scopes=scope)
         client = gspread.authorize(creds)
         sheet = client.open(SHEET_NAME).sheet1
         return sheet
@@ -49,12 +49,17 @@ def fetch_data_and_save():
     date_db = target_date.strftime("%Y-%m-%d")
     print(f"目標日期: {date_db}")
 
+    # 共用同一個連線 Session，期交所兩次請求可重用 TCP/TLS 連線
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.verify = False
+
     # 1. 抓取行情 (含三關價 & 多空分界)
     ohlc_data = None
     try:
         url = "https://www.taifex.com.tw/cht/3/futDailyMarketExcel"
         params = {'queryType':'2', 'marketCode':'0', 'commodity_id':'TX', 'queryDate':date_slash}
-        r = requests.get(url, params=params, headers=HEADERS, verify=False)
+        r = session.get(url, params=params)
         if r.status_code == 200 and len(r.content) > 500:
             df = pd.read_html(io.BytesIO(r.content))[0]
             mask = df.apply(lambda x: x.astype(str).str.contains('盤後').any(), axis=1)
@@ -92,7 +97,7 @@ def fetch_data_and_save():
     try:
         url = "https://www.taifex.com.tw/cht/3/futContractsDateExcel"
         params = {'queryType':'1', 'doQuery':'1', 'queryDate':date_slash}
-        r = requests.get(url, params=params, headers=HEADERS, verify=False)
+        r = session.get(url, params=params)
         if r.status_code == 200:
             dfs = pd.read_html(io.BytesIO(r.content))
             target_df = None
@@ -133,7 +138,7 @@ def fetch_data_and_save():
     pressure = 0
     try:
         url_twse = f"https://www.twse.com.tw/exchangeReport/MI_5MINS?response=json&date={target_date.strftime('%Y%m%d')}"
-        r = requests.get(url_twse, headers=HEADERS, verify=False)
+        r = session.get(url_twse)
         if r.status_code == 200:
             data = r.json()
             if data.get('stat') == 'OK':